@@ -1,453 +1,494 @@
-# PADMapp.py
-import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
-from datetime import datetime
-
-# Configure page
-st.set_page_config(
-    page_title="PADM - DIC Risk Predictor",
-    page_icon="⚕️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS with modern design
-st.markdown("""
-<style>
-    /* Main container styling */
-    .main-container {
-        padding: 2rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 20px;
-        box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        margin-bottom: 2rem;
-    }
-    
-    /* Card styling */
-    .card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-        margin-bottom: 1.5rem;
-        transition: transform 0.3s ease;
-    }
-    
-    .card:hover {
-        transform: translateY(-5px);
-    }
-    
-    /* Risk indicators */
-    .risk-low {
-        background: linear-gradient(135deg, #d4fc79 0%, #96e6a1 100%);
-        padding: 20px;
-        border-radius: 15px;
-        border-left: 8px solid #28a745;
-        color: #155724;
-        margin: 10px 0;
-    }
-    
-    .risk-medium {
-        background: linear-gradient(135deg, #f6d365 0%, #fda085 100%);
-        padding: 20px;
-        border-radius: 15px;
-        border-left: 8px solid #ffc107;
-        color: #856404;
-        margin: 10px 0;
-    }
-    
-    .risk-high {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        padding: 20px;
-        border-radius: 15px;
-        border-left: 8px solid #dc3545;
-        color: #721c24;
-        margin: 10px 0;
-    }
-    
-    /* Metric cards */
-    .metric-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        text-align: center;
-        margin: 0.5rem;
-    }
-    
-    /* Input styling */
-    .stNumberInput > div > div > input {
-        border-radius: 10px !important;
-        border: 2px solid #e0e0e0 !important;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 10px;
-        font-weight: bold;
-        transition: all 0.3s ease;
-        width: 100%;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-    }
-    
-    /* Header styling */
-    .main-header {
-        font-size: 3rem;
-        font-weight: 800;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    /* Subheader styling */
-    .sub-header {
-        font-size: 1.5rem;
-        color: #4a5568;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-    }
-    
-    /* Progress bar custom */
-    .risk-progress {
-        height: 25px;
-        border-radius: 12px;
-        margin: 20px 0;
-        overflow: hidden;
-    }
-    
-    .risk-progress .low {
-        background: linear-gradient(90deg, #d4fc79, #96e6a1);
-        height: 100%;
-    }
-    
-    .risk-progress .medium {
-        background: linear-gradient(90deg, #f6d365, #fda085);
-        height: 100%;
-    }
-    
-    .risk-progress .high {
-        background: linear-gradient(90deg, #f093fb, #f5576c);
-        height: 100%;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-@st.cache_resource
-def load_model():
-    """Load the trained PADM model"""
-    try:
-        model_info = joblib.load('PADM_model.pkl')
-        return model_info
-    except Exception as e:
-        st.error(f"Error loading model: {str(e)}")
-        return None
-
-def predict_risk(model_info, input_data):
-    """Make prediction using the loaded model"""
-    try:
-        calibrated_model = model_info['model']
-        prediction_proba = calibrated_model.predict_proba(input_data)[0, 1]
-        return prediction_proba
-    except Exception as e:
-        st.error(f"Prediction error: {str(e)}")
-        return None
-
-def get_risk_level(probability, thresholds=[0.222, 0.64]):
-    """Determine risk level based on probability and thresholds"""
-    if probability < thresholds[0]:
-        return "Low Risk", "risk-low", 0
-    elif probability <= thresholds[1]:
-        return "Medium Risk", "risk-medium", 1
-    else:
-        return "High Risk", "risk-high", 2
-
-def create_risk_gauge(probability):
-    """Create a simple risk gauge visualization"""
-    gauge_html = f"""
-    <div style="margin: 20px 0;">
-        <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-            <span style="color: #28a745;">Low Risk</span>
-            <span style="color: #ffc107;">Medium Risk</span>
-            <span style="color: #dc3545;">High Risk</span>
-        </div>
-        <div style="background: #f0f0f0; border-radius: 10px; height: 30px; overflow: hidden; position: relative;">
-            <div style="background: linear-gradient(90deg, #28a745 0%, #ffc107 50%, #dc3545 100%); 
-                        width: 100%; height: 100%; opacity: 0.3;"></div>
-            <div style="background: #007bff; height: 100%; width: {probability * 100}%; 
-                        border-radius: 10px; position: absolute; top: 0; left: 0;"></div>
-            <div style="position: absolute; top: 0; left: {probability * 100}%; 
-                        height: 100%; width: 3px; background: #000;"></div>
-        </div>
-        <div style="text-align: center; margin-top: 10px; font-weight: bold; font-size: 18px;">
-            Risk Score: {probability * 100:.1f}%
-        </div>
-    </div>
-    """
-    return gauge_html
-
-def get_clinical_recommendations(risk_level_str):
-    """根据风险等级提供临床建议"""
-    if "Low" in risk_level_str:
-        return [
-            "✅ **Routine Monitoring**: Maintain current monitoring frequency.",
-            "ℹ️ **Observation**: No immediate DIC-specific interventions required.",
-            "🔍 **Follow-up**: Consider repeating coagulation tests in 24-48 hours."
-        ]
-    elif "Medium" in risk_level_str:
-        return [
-            "⚠️ **Close Monitoring**: Consider shortening monitoring intervals (e.g., PT/APTT/D-Dimer every 12 hours).",
-            "💊 **Etiological Treatment**: Actively identify and manage underlying causes (infection, trauma, obstetric complications, etc.).",
-            "📊 **Scoring System**: Use ISTH or CDSS scoring systems for comprehensive assessment."
-        ]
-    else:  # High Risk
-        return [
-            "🚨 **Emergency Intervention**: High risk of overt DIC, immediate specialist consultation recommended.",
-            "💉 **Therapeutic Evaluation**: Assess need for anticoagulation (e.g., heparin) or replacement therapy (platelets/coagulation factors).",
-            "🏥 **Critical Care**: Consider ICU admission or enhanced monitoring for hemodynamic stability."
-        ]
-
-def main():
-    # Sidebar for additional information
-    with st.sidebar:
-        st.markdown("""
-        <div class="card">
-            <h3>📚 About PADM Model</h3>
-            <p>The PADM model predicts Disseminated Intravascular Coagulation (DIC) risk using four key parameters:</p>
-            <ul>
-                <li><b>PT:</b> Prothrombin Time (s)</li>
-                <li><b>APTT:</b> Activated Partial Thromboplastin Time (s)</li>
-                <li><b>D-Dimer:</b> Fibrin degradation product (mg/L)</li>
-                <li><b>MPV:</b> Mean Platelet Volume (fL)</li>
-            </ul>
-            <hr>
-            <p><small>Validated in clinical studies (AUC: 0.904, Sensitivity: 79.2%, Specificity: 90.1%)</small></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="card">
-            <h3>⚠️ Important Clinical Notes</h3>
-            <p>This tool provides risk stratification but does NOT replace:</p>
-            <ul>
-                <li>Clinical judgment and examination</li>
-                <li>Complete laboratory evaluation</li>
-                <li>Consideration of underlying conditions</li>
-                <li>Serial monitoring of parameters</li>
-            </ul>
-            <p>Always correlate with patient's clinical status.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Main content area
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        # Header
-        st.markdown('<h1 class="main-header">⚕️ PADM DIC Predictor</h1>', unsafe_allow_html=True)
-        st.markdown('<p style="text-align: center; color: #666; font-size: 1.2rem; margin-bottom: 2rem;">Predicting Disseminated Intravascular Coagulation Risk</p>', unsafe_allow_html=True)
-        
-        # Input section in card
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<h3 class="sub-header">📝 Patient Parameters</h3>', unsafe_allow_html=True)
-        
-        input_col1, input_col2 = st.columns(2)
-        
-        with input_col1:
-            PT = st.number_input(
-                "**Prothrombin Time (PT)**",
-                min_value=0.0,
-                max_value=100.0,
-                value=12.0,
-                step=0.1,
-                help="Prothrombin Time in seconds"
-            )
-            
-            D_Dimer = st.number_input(
-                "**D-Dimer**",
-                min_value=0.0,
-                max_value=50.0,
-                value=0.5,
-                step=0.1,
-                help="D-Dimer concentration in mg/L"
-            )
-        
-        with input_col2:
-            APTT = st.number_input(
-                "**Activated Partial Thromboplastin Time (APTT)**",
-                min_value=0.0,
-                max_value=200.0,
-                value=30.0,
-                step=0.1,
-                help="Activated Partial Thromboplastin Time in seconds"
-            )
-            
-            MPV = st.number_input(
-                "**Mean Platelet Volume (MPV)**",
-                min_value=0.0,
-                max_value=20.0,
-                value=10.0,
-                step=0.1,
-                help="Mean Platelet Volume in femtoliters"
-            )
-        
-        # Prediction button
-        if st.button("🔍 Calculate DIC Risk", use_container_width=True):
-            st.session_state['prediction_made'] = True
-            st.session_state['input_values'] = {
-                'PT': PT,
-                'APTT': APTT,
-                'D-Dimer': D_Dimer,
-                'MPV': MPV
-            }
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        # Load model
-        model_info = load_model()
-        
-        if model_info is None:
-            st.error("Failed to load the prediction model. Please ensure PADM_model.pkl exists.")
-            st.info("If you don't have a trained model, you can use the demo mode below.")
-            
-            # Demo mode
-            if st.button("🔄 Use Demo Mode"):
-                st.session_state['prediction_made'] = True
-                st.session_state['input_values'] = {
-                    'PT': 18.5,
-                    'APTT': 55.0,
-                    'D-Dimer': 3.2,
-                    'MPV': 12.5
-                }
-            return
-        
-        # Display results if prediction was made
-        if st.session_state.get('prediction_made', False):
-            input_df = pd.DataFrame({
-                'PT': [st.session_state['input_values']['PT']],
-                'APTT': [st.session_state['input_values']['APTT']],
-                'D-Dimer': [st.session_state['input_values']['D-Dimer']],
-                'MPV': [st.session_state['input_values']['MPV']]
-            })
-            
-            probability = predict_risk(model_info, input_df)
-            
-            if probability is not None:
-                # Results card
-                st.markdown('<div class="card">', unsafe_allow_html=True)
-                st.markdown('<h3 class="sub-header">📊 Prediction Results</h3>', unsafe_allow_html=True)
-                
-                # Risk level and probability
-                risk_level, risk_class, risk_idx = get_risk_level(probability)
-                
-                # Create metrics display
-                metric_col1, metric_col2 = st.columns(2)
-                
-                with metric_col1:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric(
-                        label="**DIC Probability**",
-                        value=f"{probability:.1%}",
-                        delta=None,
-                        help="Probability of developing DIC"
-                    )
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                with metric_col2:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    if risk_level == "Low Risk":
-                        st.metric(label="**Risk Level**", value="🟢 LOW")
-                    elif risk_level == "Medium Risk":
-                        st.metric(label="**Risk Level**", value="🟡 MEDIUM")
-                    else:
-                        st.metric(label="**Risk Level**", value="🔴 HIGH")
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Risk gauge visualization
-                st.markdown("#### 📈 Risk Visualization")
-                gauge_html = create_risk_gauge(probability)
-                st.markdown(gauge_html, unsafe_allow_html=True)
-                
-                # Risk level display
-                st.markdown(f'<div class="{risk_class}">', unsafe_allow_html=True)
-                st.markdown(f"### {risk_level}")
-                
-                if risk_level == "Low Risk":
-                    st.markdown("**Probability < 22.2%** - Routine monitoring recommended")
-                elif risk_level == "Medium Risk":
-                    st.markdown("**Probability 22.2% - 64.0%** - Increased vigilance required")
-                else:
-                    st.markdown("**Probability > 64.0%** - Urgent intervention needed")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Clinical recommendations
-                st.markdown('<div class="card">', unsafe_allow_html=True)
-                st.markdown("### 📋 Clinical Recommendations")
-                
-                recommendations = get_clinical_recommendations(risk_level)
-                
-                if recommendations:
-                    for rec in recommendations:
-                        st.markdown(f"• {rec}")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-        
-        else:
-            # Placeholder before prediction
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            st.markdown('<h3 class="sub-header">📊 Prediction Results</h3>', unsafe_allow_html=True)
-            st.info("👈 Enter patient parameters and click 'Calculate DIC Risk' to see predictions")
-            
-            # Display sample risk gauge
-            sample_gauge = create_risk_gauge(0)
-            st.markdown(sample_gauge, unsafe_allow_html=True)
-            
-            st.markdown("""
-            #### 🎯 Risk Categories
-            - **🟢 Low Risk**: <22.2% probability
-            - **🟡 Medium Risk**: 22.2%-64% probability  
-            - **🔴 High Risk**: >64% probability
-            """)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Sample recommendations placeholder
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            st.markdown("### 📋 Clinical Recommendations")
-            st.info("Risk-specific clinical guidance will appear here after calculation")
-            st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Footer
-    st.markdown("---")
-    col_footer1, col_footer2 = st.columns(2)
-    
-    with col_footer1:
-        st.markdown("**⚠️ Disclaimer**")
-        st.markdown("*Clinical decision support tool only*")
-    
-    with col_footer2:
-        st.markdown("**📅 Version**")
-        st.markdown(f"PADM v1.0 • {datetime.now().strftime('%Y-%m-%d')}")
-
-if __name__ == "__main__":
-    if 'prediction_made' not in st.session_state:
-        st.session_state['prediction_made'] = False
-    if 'input_values' not in st.session_state:
-        st.session_state['input_values'] = {}
-    
+# PADMapp.py
+import streamlit as st
+import pandas as pd
+import numpy as np
+import joblib
+from datetime import datetime
+from types import MappingProxyType
+
+# Configure page
+st.set_page_config(
+    page_title="PADM - DIC Risk Predictor",
+    page_icon="⚕️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS lives in static/padm.css and is served by Streamlit's
+# static file server (enableStaticServing in .streamlit/config.toml),
+# so reruns send a one-line <link> instead of the full style block
+_CSS_LINK = '<link rel="stylesheet" href="app/static/padm.css">'
+
+@st.cache_resource
+def _inject_css():
+    """Emit the stylesheet link once per session; cached reruns replay the
+    element without re-sending any CSS over the websocket"""
+    st.markdown(_CSS_LINK, unsafe_allow_html=True)
+
+def _fast_positive_proba(calibrated_model, X):
+    """Positive-class probabilities straight from the per-fold calibrators
+
+    Feeds each fold's decision_function through its calibrator and
+    averages, skipping the input validation and two-class probability
+    assembly that the generic predict_proba performs. Only the positive
+    column is ever displayed, so the rest is wasted work.
+    """
+    folds = calibrated_model.calibrated_classifiers_
+    total = 0.0
+    for fold in folds:
+        decision = fold.estimator.decision_function(X)
+        total = total + fold.calibrators[0].predict(decision)
+    return total / len(folds)
+
+@st.cache_resource
+def load_model():
+    """Load the trained PADM model and cache its prediction entry point
+
+    predict_fn maps an (N, 4) float array to the (N,) positive-class
+    probabilities.
+    """
+    try:
+        # Memory-map the arrays inside the pickle so they are paged in
+        # on demand and shared between worker processes instead of
+        # copied into each process's heap (model is dumped uncompressed)
+        model_info = joblib.load('PADM_model.pkl', mmap_mode='r')
+        calibrated_model = model_info['model']
+
+        def predict_fn(X):
+            return _fast_positive_proba(calibrated_model, X)
+        # Warm up with a throwaway inference so the model's first-call
+        # setup happens at app boot, not inside the first click
+        try:
+            predict_fn(np.zeros((1, 4), dtype=np.float32))
+        except Exception:
+            pass
+        return model_info, predict_fn
+    except Exception as e:
+        st.error(f"Error loading model: {str(e)}")
+        return None, None
+
+def predict_risk(predict_fn, input_data):
+    """Predict DIC probabilities for an (N, 4) input array
+
+    Returns an (N,) array of positive-class probabilities so batch
+    workloads run through one vectorized call; single-patient callers
+    index [0].
+    """
+    try:
+        return predict_fn(input_data)
+    except Exception as e:
+        st.error(f"Prediction error: {str(e)}")
+        return None
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_predict(pt, aptt, d_dimer, mpv):
+    """Memoize predictions on the input tuple across reruns"""
+    _, predict_fn = load_model()
+    input_buf = st.session_state.setdefault(
+        '_input_buf', np.empty((1, 4), dtype=np.float32)
+    )
+    input_buf[0, 0] = pt
+    input_buf[0, 1] = aptt
+    input_buf[0, 2] = d_dimer
+    input_buf[0, 3] = mpv
+    probability = predict_risk(predict_fn, input_buf)
+    return None if probability is None else float(probability[0])
+
+_FEATURES = ('PT', 'APTT', 'D-Dimer', 'MPV')
+# Cached list form for pandas column selection, which needs a list-like
+_FEATURE_COLS = list(_FEATURES)
+
+# Risk thresholds and labels precomputed so classification is a single
+# branchless lookup instead of rebuilding the default list per call
+_RISK_THRESHOLDS = np.array([0.222, 0.64])
+_RISK_TABLE = (
+    ("Low Risk", "risk-low", 0),
+    ("Medium Risk", "risk-medium", 1),
+    ("High Risk", "risk-high", 2)
+)
+
+def get_risk_level(probability):
+    """Determine risk level based on probability and the model thresholds"""
+    return _RISK_TABLE[np.searchsorted(_RISK_THRESHOLDS, probability, side='right')]
+
+# Gauge template hoisted to module scope so reruns only pay for the
+# percentage substitution, not re-parsing the whole multiline literal
+_GAUGE_TMPL = """
+    <div style="margin: 20px 0;">
+        <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+            <span style="color: #28a745;">Low Risk</span>
+            <span style="color: #ffc107;">Medium Risk</span>
+            <span style="color: #dc3545;">High Risk</span>
+        </div>
+        <div style="background: #f0f0f0; border-radius: 10px; height: 30px; overflow: hidden; position: relative;">
+            <div style="background: linear-gradient(90deg, #28a745 0%, #ffc107 50%, #dc3545 100%);
+                        width: 100%; height: 100%; opacity: 0.3;"></div>
+            <div style="background: #007bff; height: 100%; width: {percent}%;
+                        border-radius: 10px; position: absolute; top: 0; left: 0;"></div>
+            <div style="position: absolute; top: 0; left: {percent}%;
+                        height: 100%; width: 3px; background: #000;"></div>
+        </div>
+        <div style="text-align: center; margin-top: 10px; font-weight: bold; font-size: 18px;">
+            Risk Score: {percent:.1f}%
+        </div>
+    </div>
+    """
+
+def create_risk_gauge(probability):
+    """Create a simple risk gauge visualization"""
+    if probability == 0:
+        return _EMPTY_GAUGE_HTML
+    return _GAUGE_TMPL.format(percent=probability * 100)
+
+# The pre-prediction placeholder is always the zero gauge; format it once
+_EMPTY_GAUGE_HTML = _GAUGE_TMPL.format(percent=0.0)
+
+# Reference ranges as parallel arrays so the in/out-of-range check is one
+# vectorized comparison instead of per-parameter dict lookups and branches
+_NORMAL_MINS = np.array([11.0, 25.0, 0.0, 7.5])
+_NORMAL_MAXS = np.array([13.5, 35.0, 0.5, 11.5])
+
+_PARAM_ROW_TMPL = """
+        <div style="display: flex; justify-content: space-between; padding: 6px 0; border-bottom: 1px solid #eee;">
+            <span><b>{param}</b></span>
+            <span>{value:.1f}</span>
+            <span style="color: #888;">Normal: {nmin:.1f}-{nmax:.1f}</span>
+            <span style="color: {color}; font-weight: bold;">{status}</span>
+        </div>"""
+
+def create_parameter_display(values):
+    """Build the HTML block listing each parameter against its normal range"""
+    v = np.fromiter((values[p] for p in _FEATURES), float, len(_FEATURES))
+    abnormal = (v < _NORMAL_MINS) | (v > _NORMAL_MAXS)
+    rows = [
+        _PARAM_ROW_TMPL.format(
+            param=param,
+            value=value,
+            nmin=nmin,
+            nmax=nmax,
+            color="#dc3545" if is_abnormal else "#28a745",
+            status="Abnormal" if is_abnormal else "Normal"
+        )
+        for param, value, nmin, nmax, is_abnormal
+        in zip(_FEATURES, v, _NORMAL_MINS, _NORMAL_MAXS, abnormal)
+    ]
+    return '<div style="margin: 10px 0;">' + "".join(rows) + '</div>'
+
+# Recommendations built once at import; per-call work is a single dict.get
+_RECOMMENDATIONS = MappingProxyType({
+    "Low Risk": (
+        "✅ **Routine Monitoring**: Maintain current monitoring frequency.",
+        "ℹ️ **Observation**: No immediate DIC-specific interventions required.",
+        "🔍 **Follow-up**: Consider repeating coagulation tests in 24-48 hours."
+    ),
+    "Medium Risk": (
+        "⚠️ **Close Monitoring**: Consider shortening monitoring intervals (e.g., PT/APTT/D-Dimer every 12 hours).",
+        "💊 **Etiological Treatment**: Actively identify and manage underlying causes (infection, trauma, obstetric complications, etc.).",
+        "📊 **Scoring System**: Use ISTH or CDSS scoring systems for comprehensive assessment."
+    ),
+    "High Risk": (
+        "🚨 **Emergency Intervention**: High risk of overt DIC, immediate specialist consultation recommended.",
+        "💉 **Therapeutic Evaluation**: Assess need for anticoagulation (e.g., heparin) or replacement therapy (platelets/coagulation factors).",
+        "🏥 **Critical Care**: Consider ICU admission or enhanced monitoring for hemodynamic stability."
+    )
+})
+
+def get_clinical_recommendations(risk_level_str):
+    """根据风险等级提供临床建议"""
+    return _RECOMMENDATIONS.get(risk_level_str, ())
+
+@st.cache_data(ttl=3600)
+def _today():
+    """Footer date, cached so reruns skip the clock syscall and strftime"""
+    return datetime.now().strftime('%Y-%m-%d')
+
+# Sidebar cards are fully static; keep them as module constants so the
+# render path passes prebuilt strings instead of re-parsing literals
+_SIDEBAR_ABOUT = """
+<div class="card">
+    <h3>📚 About PADM Model</h3>
+    <p>The PADM model predicts Disseminated Intravascular Coagulation (DIC) risk using four key parameters:</p>
+    <ul>
+        <li><b>PT:</b> Prothrombin Time (s)</li>
+        <li><b>APTT:</b> Activated Partial Thromboplastin Time (s)</li>
+        <li><b>D-Dimer:</b> Fibrin degradation product (mg/L)</li>
+        <li><b>MPV:</b> Mean Platelet Volume (fL)</li>
+    </ul>
+    <hr>
+    <p><small>Validated in clinical studies (AUC: 0.904, Sensitivity: 79.2%, Specificity: 90.1%)</small></p>
+</div>
+"""
+
+_SIDEBAR_CLINICAL_NOTES = """
+<div class="card">
+    <h3>⚠️ Important Clinical Notes</h3>
+    <p>This tool provides risk stratification but does NOT replace:</p>
+    <ul>
+        <li>Clinical judgment and examination</li>
+        <li>Complete laboratory evaluation</li>
+        <li>Consideration of underlying conditions</li>
+        <li>Serial monitoring of parameters</li>
+    </ul>
+    <p>Always correlate with patient's clinical status.</p>
+</div>
+"""
+
+@st.fragment
+def _results_panel():
+    """Render the prediction results column
+
+    Scoped to an st.fragment so interactions inside it rerun only this
+    panel instead of the whole script (sidebar, header, inputs).
+    """
+    # Load model
+    model_info, predict_fn = load_model()
+
+    if model_info is None:
+        st.error("Failed to load the prediction model. Please ensure PADM_model.pkl exists.")
+        st.info("If you don't have a trained model, you can use the demo mode below.")
+        
+        # Demo mode
+        if st.button("🔄 Use Demo Mode"):
+            st.session_state['prediction_made'] = True
+            st.session_state['input_values'] = {
+                'PT': 18.5,
+                'APTT': 55.0,
+                'D-Dimer': 3.2,
+                'MPV': 12.5
+            }
+        return
+    
+    # Display results if prediction was made
+    if st.session_state.get('prediction_made', False):
+        # Memoized on the input tuple, so reruns triggered by unrelated
+        # widget interactions skip the calibrated pipeline entirely
+        probability = cached_predict(
+            st.session_state['input_values']['PT'],
+            st.session_state['input_values']['APTT'],
+            st.session_state['input_values']['D-Dimer'],
+            st.session_state['input_values']['MPV']
+        )
+        
+        if probability is not None:
+            # Results card
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.markdown('<h3 class="sub-header">📊 Prediction Results</h3>', unsafe_allow_html=True)
+            
+            # Risk level and probability
+            risk_level, risk_class, risk_idx = get_risk_level(probability)
+            
+            # Create metrics display
+            metric_col1, metric_col2 = st.columns(2)
+            
+            with metric_col1:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                st.metric(
+                    label="**DIC Probability**",
+                    value=f"{probability:.1%}",
+                    delta=None,
+                    help="Probability of developing DIC"
+                )
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with metric_col2:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                if risk_level == "Low Risk":
+                    st.metric(label="**Risk Level**", value="🟢 LOW")
+                elif risk_level == "Medium Risk":
+                    st.metric(label="**Risk Level**", value="🟡 MEDIUM")
+                else:
+                    st.metric(label="**Risk Level**", value="🔴 HIGH")
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Risk gauge visualization
+            st.markdown("#### 📈 Risk Visualization")
+            gauge_html = create_risk_gauge(probability)
+            st.markdown(gauge_html, unsafe_allow_html=True)
+
+            # Entered parameters against their normal ranges
+            st.markdown("#### 🧪 Parameter Overview")
+            param_html = create_parameter_display(st.session_state['input_values'])
+            st.markdown(param_html, unsafe_allow_html=True)
+
+            # Risk level display
+            st.markdown(f'<div class="{risk_class}">', unsafe_allow_html=True)
+            st.markdown(f"### {risk_level}")
+            
+            if risk_level == "Low Risk":
+                st.markdown("**Probability < 22.2%** - Routine monitoring recommended")
+            elif risk_level == "Medium Risk":
+                st.markdown("**Probability 22.2% - 64.0%** - Increased vigilance required")
+            else:
+                st.markdown("**Probability > 64.0%** - Urgent intervention needed")
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Clinical recommendations
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.markdown("### 📋 Clinical Recommendations")
+            
+            recommendations = get_clinical_recommendations(risk_level)
+            
+            if recommendations:
+                for rec in recommendations:
+                    st.markdown(f"• {rec}")
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+    
+    else:
+        # Placeholder before prediction
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<h3 class="sub-header">📊 Prediction Results</h3>', unsafe_allow_html=True)
+        st.info("👈 Enter patient parameters and click 'Calculate DIC Risk' to see predictions")
+        
+        # Display sample risk gauge
+        sample_gauge = create_risk_gauge(0)
+        st.markdown(sample_gauge, unsafe_allow_html=True)
+        
+        st.markdown("""
+        #### 🎯 Risk Categories
+        - **🟢 Low Risk**: <22.2% probability
+        - **🟡 Medium Risk**: 22.2%-64% probability  
+        - **🔴 High Risk**: >64% probability
+        """)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Sample recommendations placeholder
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("### 📋 Clinical Recommendations")
+        st.info("Risk-specific clinical guidance will appear here after calculation")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+def main():
+    _inject_css()
+
+    # Sidebar for additional information
+    with st.sidebar:
+        st.markdown(_SIDEBAR_ABOUT, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_CLINICAL_NOTES, unsafe_allow_html=True)
+
+    # Main content area
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        # Header
+        st.markdown('<h1 class="main-header">⚕️ PADM DIC Predictor</h1>', unsafe_allow_html=True)
+        st.markdown('<p style="text-align: center; color: #666; font-size: 1.2rem; margin-bottom: 2rem;">Predicting Disseminated Intravascular Coagulation Risk</p>', unsafe_allow_html=True)
+        
+        # Input section in card
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<h3 class="sub-header">📝 Patient Parameters</h3>', unsafe_allow_html=True)
+        
+        # Widgets inside a form don't trigger reruns while the user
+        # types; the script runs once when the form is submitted
+        with st.form('params', clear_on_submit=False):
+            input_col1, input_col2 = st.columns(2)
+        
+            with input_col1:
+                PT = st.number_input(
+                    "**Prothrombin Time (PT)**",
+                    min_value=0.0,
+                    max_value=100.0,
+                    value=12.0,
+                    step=0.1,
+                    help="Prothrombin Time in seconds"
+                )
+            
+                D_Dimer = st.number_input(
+                    "**D-Dimer**",
+                    min_value=0.0,
+                    max_value=50.0,
+                    value=0.5,
+                    step=0.1,
+                    help="D-Dimer concentration in mg/L"
+                )
+        
+            with input_col2:
+                APTT = st.number_input(
+                    "**Activated Partial Thromboplastin Time (APTT)**",
+                    min_value=0.0,
+                    max_value=200.0,
+                    value=30.0,
+                    step=0.1,
+                    help="Activated Partial Thromboplastin Time in seconds"
+                )
+            
+                MPV = st.number_input(
+                    "**Mean Platelet Volume (MPV)**",
+                    min_value=0.0,
+                    max_value=20.0,
+                    value=10.0,
+                    step=0.1,
+                    help="Mean Platelet Volume in femtoliters"
+                )
+        
+            # Submitting the form commits all four inputs in one rerun
+            if st.form_submit_button("🔍 Calculate DIC Risk", use_container_width=True):
+                st.session_state['prediction_made'] = True
+                st.session_state['input_values'] = {
+                    'PT': PT,
+                    'APTT': APTT,
+                    'D-Dimer': D_Dimer,
+                    'MPV': MPV
+                }
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Batch prediction: one vectorized predict call for a whole CSV
+        # instead of looping the single-patient path per row
+        with st.expander("📁 Batch Prediction (CSV upload)"):
+            st.markdown("Upload a CSV with columns: `PT`, `APTT`, `D-Dimer`, `MPV`")
+            uploaded_file = st.file_uploader(
+                "Patient CSV", type="csv", label_visibility="collapsed"
+            )
+            if uploaded_file is not None:
+                batch_model_info, batch_predict_fn = load_model()
+                if batch_model_info is None:
+                    st.error("Failed to load the prediction model.")
+                else:
+                    batch_df = pd.read_csv(uploaded_file)
+                    missing_cols = [c for c in _FEATURES if c not in batch_df.columns]
+                    if missing_cols:
+                        st.error(f"Missing columns: {missing_cols}")
+                    else:
+                        try:
+                            X_batch = batch_df[_FEATURE_COLS].to_numpy(dtype=np.float32)
+                        except Exception as e:
+                            st.error(f"CSV contains non-numeric values: {str(e)}")
+                            X_batch = None
+                        batch_probs = None
+                        if X_batch is not None:
+                            batch_probs = predict_risk(batch_predict_fn, X_batch)
+                        if batch_probs is not None:
+                            levels = np.searchsorted(
+                                _RISK_THRESHOLDS, batch_probs, side='right'
+                            )
+                            batch_df['DIC Probability'] = batch_probs
+                            batch_df['Risk Level'] = [_RISK_TABLE[i][0] for i in levels]
+                            st.dataframe(batch_df, use_container_width=True)
+
+    with col2:
+        _results_panel()
+
+    # Footer
+    st.markdown("---")
+    col_footer1, col_footer2 = st.columns(2)
+    
+    with col_footer1:
+        st.markdown("**⚠️ Disclaimer**")
+        st.markdown("*Clinical decision support tool only*")
+    
+    with col_footer2:
+        st.markdown("**📅 Version**")
+        st.markdown(f"PADM v1.0 • {_today()}")
+
+if __name__ == "__main__":
+    if 'prediction_made' not in st.session_state:
+        st.session_state['prediction_made'] = False
+    if 'input_values' not in st.session_state:
+        st.session_state['input_values'] = {}
+    
     main()
\ No newline at end of file